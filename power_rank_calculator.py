@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import math
+from bisect import bisect_right
 from typing import Dict, List, Optional, Tuple
 
 # ── Category max points ───────────────────────────────────────────────────────
@@ -27,7 +28,7 @@ SALES_MULTIPLIERS: Dict[float, float] = {
      70: 0.6,  60: 0.5, 50: 0.4, 40: 0.3,
      30: 0.2,  20: 0.1,  0: 0.0,
 }
-_SALES_THRESHOLDS: List[float] = sorted(SALES_MULTIPLIERS, reverse=True)
+_SALES_THRESHOLDS_ASC: Tuple[float, ...] = tuple(sorted(SALES_MULTIPLIERS))
 
 # Attach-rate categories use exact percentage breakpoints.
 PROTECTION_TABLE: List[Tuple[float, float]] = [
@@ -48,6 +49,33 @@ _ATTACH_TABLES: Dict[str, List[Tuple[float, float]]] = {
     "next_up":    NEXT_UP_TABLE,
 }
 
+# Ascending (thresholds, points) pairs for bisect lookups in percent_to_points.
+_ATTACH_BREAKPOINTS: Dict[str, Tuple[Tuple[float, ...], Tuple[float, ...]]] = {
+    m: (tuple(t for t, _ in reversed(table)), tuple(p for _, p in reversed(table)))
+    for m, table in _ATTACH_TABLES.items()
+}
+
+# Sales-to-goal points are fixed per tier, so round them once here.
+_SALES_BREAKPOINTS: Dict[str, Tuple[Tuple[float, ...], Tuple[float, ...]]] = {
+    m: (
+        _SALES_THRESHOLDS_ASC,
+        tuple(round(max_pts * SALES_MULTIPLIERS[t], 2) for t in _SALES_THRESHOLDS_ASC),
+    )
+    for m, max_pts in METRIC_MAX_POINTS.items()
+    if m not in _ATTACH_TABLES
+}
+
+# Every scored metric in one table, so scoring needs a single dict probe.
+_BREAKPOINTS: Dict[str, Tuple[Tuple[float, ...], Tuple[float, ...]]] = {
+    **_SALES_BREAKPOINTS, **_ATTACH_BREAKPOINTS,
+}
+
+# Top-tier points per metric, the ceiling used by path_to_rank, held in
+# integer cents so the greedy plan can add them without re-rounding.
+_FULL_POINTS_CENTS: Dict[str, int] = {
+    m: round(_BREAKPOINTS[m][1][-1] * 100) for m in METRIC_MAX_POINTS
+}
+
 # ── Commission rates by rank tier ─────────────────────────────────────────────
 
 COMMISSION_TIERS: Dict[str, Dict[str, float]] = {
@@ -82,26 +110,24 @@ def percent_to_points(metric: str, percent: float) -> float:
     if percent is None:
         return 0.0
 
-    table = _ATTACH_TABLES.get(metric)
-    if table is not None:
-        for threshold, pts in table:
-            if percent >= threshold:
-                return pts
-        return 0.0
-
-    max_pts = METRIC_MAX_POINTS.get(metric)
-    if max_pts is None:
+    breakpoints = _BREAKPOINTS.get(metric)
+    if breakpoints is None:
         raise KeyError(f"Unknown metric: {metric!r}")
 
-    for threshold in _SALES_THRESHOLDS:
-        if percent >= threshold:
-            return round(max_pts * SALES_MULTIPLIERS[threshold], 2)
-    return 0.0
+    # `not percent >= lowest` also catches NaN, which bisect would place last.
+    # Snapshots often sit below the first tier or past the last, so both
+    # ends are answered without bisecting.
+    thresholds, pts = breakpoints
+    if not percent >= thresholds[0]:
+        return 0.0
+    if percent >= thresholds[-1]:
+        return pts[-1]
+    return pts[bisect_right(thresholds, percent) - 1]
 
 
 def compute_points(metrics: Dict[str, float]) -> Dict[str, float]:
     """Return {metric: points} for every recognised metric in *metrics*."""
-    return {m: percent_to_points(m, v) for m, v in metrics.items() if m in METRIC_MAX_POINTS}
+    return {m: percent_to_points(m, v) for m, v in metrics.items() if m in _BREAKPOINTS}
 
 
 def compute_power_rank(points: Dict[str, float]) -> Tuple[float, float]:
@@ -124,8 +150,8 @@ def simulate_what_if(
     before_pts              = compute_points(metrics)
     before_total, before_rk = compute_power_rank(before_pts)
 
-    updated                 = {**metrics, **changes}
-    after_pts               = compute_points(updated)
+    # Only the changed metrics need re-scoring; the rest carry over as-is.
+    after_pts               = {**before_pts, **compute_points(changes)}
     after_total, after_rk   = compute_power_rank(after_pts)
 
     return {
@@ -154,30 +180,33 @@ def path_to_rank(
     target_total           = round(target_rank * 10, 2)
     needed                 = max(0.0, round(target_total - current_total, 2))
 
-    # Maximum gain possible per metric (push to 125 %)
+    # Maximum gain possible per metric (push to 125 %).  Points are whole
+    # cents, so the plan is tallied in integer cents and converted once.
+    # Candidates are (-gain, position, metric, pct) tuples: a plain sort then
+    # puts the biggest gain first and keeps METRIC_MAX_POINTS order on ties.
     candidates = []
-    for metric in METRIC_MAX_POINTS:
-        cur_pct  = metrics.get(metric, 0.0)
-        cur_pts  = percent_to_points(metric, cur_pct)
-        max_pts  = percent_to_points(metric, 125)
-        gain     = round(max_pts - cur_pts, 2)
-        if gain > 0:
-            candidates.append({"metric": metric, "current_pct": cur_pct,
-                                "current_pts": cur_pts, "max_gain": gain})
-
-    candidates.sort(key=lambda x: x["max_gain"], reverse=True)
-
-    actions   = []
-    projected = current_total
-    for c in candidates:
-        if projected >= target_total:
+    for i, metric in enumerate(METRIC_MAX_POINTS):
+        cur_pct    = metrics.get(metric, 0.0)
+        cur_pts    = current_pts.get(metric, 0.0)
+        gain_cents = _FULL_POINTS_CENTS[metric] - round(cur_pts * 100)
+        if gain_cents > 0:
+            candidates.append((-gain_cents, i, metric, cur_pct))
+
+    candidates.sort()
+
+    actions         = []
+    target_cents    = round(target_total * 100, 0)
+    projected_cents = round(current_total * 100)
+    for neg_gain, _, metric, cur_pct in candidates:
+        if projected_cents >= target_cents:
             break
         actions.append({
-            "metric":       c["metric"],
-            "current_pct":  c["current_pct"],
-            "points_added": c["max_gain"],
+            "metric":       metric,
+            "current_pct":  cur_pct,
+            "points_added": -neg_gain / 100,
         })
-        projected = round(projected + c["max_gain"], 2)
+        projected_cents -= neg_gain
+    projected = projected_cents / 100 if actions else current_total
 
     return {
         "current_rank":        cur_rk,
@@ -237,14 +266,20 @@ def project_commission(
 
 # ── Report helper ─────────────────────────────────────────────────────────────
 
+# Per-metric (name, padded label, "/ max pts" suffix); only the values vary.
+_REPORT_ROWS: Tuple[Tuple[str, str, str], ...] = tuple(
+    (m, f"  {m:<14} ", f" / {max_p:.0f} pts") for m, max_p in METRIC_MAX_POINTS.items()
+)
+
+
 def generate_report(metrics: Dict[str, float]) -> str:
     pts          = compute_points(metrics)
     total, rank  = compute_power_rank(pts)
     lines        = ["Power Rank Report", "=" * 42]
-    for m, max_p in METRIC_MAX_POINTS.items():
+    for m, label, suffix in _REPORT_ROWS:
         pct = metrics.get(m, 0.0)
         p   = pts.get(m, 0.0)
-        lines.append(f"  {m:<14} {pct:>6.1f}%  →  {p:>5.2f} / {max_p:.0f} pts")
+        lines.append(f"{label}{pct:>6.1f}%  →  {p:>5.2f}{suffix}")
     lines += [
         "-" * 42,
         f"  Total Points:   {total:.2f}",